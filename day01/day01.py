@@ -1,33 +1,98 @@
-from typing import List
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from heapq import merge, nlargest
+from typing import List, Iterable, Iterator, Tuple, Optional
+
+INPUT_FILE = 'day 01-1 input.txt'
+blank_line_pattern = re.compile(rb'\r?\n[ \t]*\r?\n')
+
+
+def elf_totals(lines: Iterable[str]) -> Iterator[int]:
+    total = 0
+    in_group = False
+    for line in lines:
+        data = line.strip()
+        if data:
+            total += int(data)
+            in_group = True
+        elif in_group:
+            yield total
+            total = 0
+            in_group = False
+    if in_group:
+        yield total
+
+
+def top_totals(totals: Iterable[int], k: int = 3) -> List[int]:
+    return nlargest(k, totals)
+
+
+def day01_read_top(k: int = 3, filename: str = INPUT_FILE) -> List[int]:
+    with open(filename) as f:
+        return top_totals(elf_totals(f), k)
 
 
 def day01_read_data() -> List[int]:
-    totals = [0]
-    index = 0
-    with open('day 01-1 input.txt') as f:
-        for line in f:
-            data = line.strip()
-            try:
-                totals[index] += int(data)
-            except ValueError:
-                index += 1
-                totals.append(0)
-    return totals
+    with open(INPUT_FILE) as f:
+        return list(elf_totals(f))
+
+
+def chunk_bounds(data: mmap.mmap, chunks: int) -> List[Tuple[int, int]]:
+    size = len(data)
+    bounds = []
+    start = 0
+    for i in range(1, chunks):
+        if not (match := blank_line_pattern.search(data, max(start, size * i // chunks))):
+            break
+        bounds.append((start, match.end()))
+        start = match.end()
+    bounds.append((start, size))
+    return bounds
+
+
+def mapped_totals(data: mmap.mmap, start: int, end: int) -> Iterator[int]:
+    for match in blank_line_pattern.finditer(data, start, end):
+        if items := data[start:match.start()].split():
+            yield sum(map(int, items))
+        start = match.end()
+    if items := data[start:end].split():
+        yield sum(map(int, items))
+
+
+def _chunk_top(filename: str, start: int, end: int, k: int) -> List[int]:
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return top_totals(mapped_totals(data, start, end), k)
+
+
+def day01_read_top_parallel(k: int = 3, filename: str = INPUT_FILE, workers: Optional[int] = None) -> List[int]:
+    if not os.path.getsize(filename):
+        return []
+    workers = workers or os.cpu_count() or 1
+    with open(filename, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        bounds = chunk_bounds(data, workers)
+    with ProcessPoolExecutor(workers) as pool:
+        results = pool.map(_chunk_top, *zip(*[(filename, start, end, k) for start, end in bounds]))
+        return list(merge(*results, reverse=True))[:k]
+
+
+def day01() -> Tuple[int, int]:
+    top = day01_read_top(3)
+    return top[0], sum(top)
 
 
 def day01_1() -> int:
-    totals = day01_read_data()
-    return max(totals)
+    return day01_read_top(1)[0]
 
 
 def day01_2() -> int:
-    totals = sum(sorted(day01_read_data(), reverse=True)[:3])
-    return totals
+    return sum(day01_read_top(3))
 
 
 # Press the green button in the gutter to run the script.
 if __name__ == '__main__':
-    print(day01_1())
-    print(day01_2())
+    for answer in day01():
+        print(answer)
 
 # See PyCharm help at https://www.jetbrains.com/help/pycharm/
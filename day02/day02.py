@@ -1,4 +1,16 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterable
+
+import numpy as np
+from numpy.typing import NDArray
+
+PART1_SHAPE_SCORES = {'X': 1, 'Y': 2, 'Z': 3}
+PART1_OUTCOME_SCORES = {'A': {'X': 3, 'Y': 6, 'Z': 0},
+                        'B': {'X': 0, 'Y': 3, 'Z': 6},
+                        'C': {'X': 6, 'Y': 0, 'Z': 3}}
+PART2_SHAPE_SCORES = {'X': 0, 'Y': 3, 'Z': 6}
+PART2_OUTCOME_SCORES = {'A': {'X': 3, 'Y': 1, 'Z': 2},
+                        'B': {'X': 1, 'Y': 2, 'Z': 3},
+                        'C': {'X': 2, 'Y': 3, 'Z': 1}}
 
 
 def read_and_play(shape_scores: Dict[str, int], outcome_scores: Dict[str, Dict[str, int]]
@@ -20,20 +32,43 @@ def score_round(outcome: Tuple[str, str, int, int]) -> int:
     return shape_score + outcome_score
 
 
+def read_rounds(filename: str = 'day02input.txt') -> NDArray[np.uint8]:
+    with open(filename, 'rb') as f:
+        data = np.frombuffer(f.read(), dtype=np.uint8)
+    opponents = data[(data >= ord('A')) & (data <= ord('C'))] - ord('A')
+    players = data[(data >= ord('X')) & (data <= ord('Z'))] - ord('X')
+    return opponents * 3 + players
+
+
+def score_table(shape_scores: Dict[str, int], outcome_scores: Dict[str, Dict[str, int]]) -> NDArray[int]:
+    return np.array([shape_scores[player] + outcome_scores[opponent][player]
+                     for opponent in 'ABC' for player in 'XYZ'])
+
+
+def round_histogram(rounds: NDArray[np.uint8]) -> NDArray[np.int64]:
+    return np.bincount(rounds, minlength=9).astype(np.int64)
+
+
+def score_strategies(histogram: NDArray[np.int64],
+                     strategies: Iterable[Tuple[Dict[str, int], Dict[str, Dict[str, int]]]]) -> NDArray[np.int64]:
+    tables = np.array([score_table(shape_scores, outcome_scores) for shape_scores, outcome_scores in strategies],
+                      dtype=np.int64).reshape(-1, 9)
+    return tables @ histogram
+
+
+def day02() -> Tuple[int, int]:
+    part1, part2 = score_strategies(round_histogram(read_rounds()),
+                                    [(PART1_SHAPE_SCORES, PART1_OUTCOME_SCORES),
+                                     (PART2_SHAPE_SCORES, PART2_OUTCOME_SCORES)])
+    return int(part1), int(part2)
+
+
 def day02_1() -> int:
-    shape_scores = {'X': 1, 'Y': 2, 'Z': 3}
-    outcome_scores = {'A': {'X': 3, 'Y': 6, 'Z': 0},
-                      'B': {'X': 0, 'Y': 3, 'Z': 6},
-                      'C': {'X': 6, 'Y': 0, 'Z': 3}}
-    return sum(map(score_round, read_and_play(shape_scores, outcome_scores)))
+    return day02()[0]
 
 
 def day02_2() -> int:
-    shape_scores = {'X': 0, 'Y': 3, 'Z': 6}
-    outcome_scores = {'A': {'X': 3, 'Y': 1, 'Z': 2},
-                      'B': {'X': 1, 'Y': 2, 'Z': 3},
-                      'C': {'X': 2, 'Y': 3, 'Z': 1}}
-    return sum(map(score_round, read_and_play(shape_scores, outcome_scores)))
+    return day02()[1]
 
 
 if __name__ == '__main__':
@@ -1,8 +1,9 @@
 from functools import reduce
-from itertools import chain
-from typing import Tuple, Set
+from operator import or_
+from typing import Tuple, Set, List
 
-from more_itertools import chunked
+import numpy as np
+from numpy.typing import NDArray
 
 
 def halve(pack: str) -> Tuple[str, str]:
@@ -22,21 +23,83 @@ def char_to_priority(char: str) -> int:
         return ord(char) - 96
 
 
+BYTE_BITS: List[int] = [
+    1 << char_to_priority(chr(b)) if chr(b).isascii() and chr(b).isalpha() else 0 for b in range(256)
+]
+
+
+def item_mask(items: bytes) -> int:
+    return reduce(or_, map(BYTE_BITS.__getitem__, items), 0)
+
+
+def mask_priority(mask: int) -> int:
+    total = 0
+    while mask:
+        bit = mask & -mask
+        total += bit.bit_length() - 1
+        mask ^= bit
+    return total
+
+
+def day03(filename: str = 'day03input.txt') -> Tuple[int, int]:
+    compartments = 0
+    badges = 0
+    group = -1
+    lines = 0
+    with open(filename, 'rb') as f:
+        for lines, line in enumerate(f, 1):
+            pack = line.strip()
+            mid = len(pack) // 2
+            left, right = item_mask(pack[:mid]), item_mask(pack[mid:])
+            compartments += mask_priority(left & right)
+            group &= left | right
+            if lines % 3 == 0:
+                badges += mask_priority(group)
+                group = -1
+    if lines % 3:
+        badges += mask_priority(group)
+    return compartments, badges
+
+
+BYTE_PRIORITIES: NDArray[np.uint8] = np.array([mask.bit_length() - 1 if mask else 0 for mask in BYTE_BITS],
+                                              dtype=np.uint8)
+PRIORITIES: NDArray[int] = np.arange(53)
+
+
+def presence_matrices(data: bytes) -> Tuple[NDArray[bool], NDArray[bool]]:
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    line_ids = np.cumsum(buffer == ord('\n')) - (buffer == ord('\n'))
+    lines = int(line_ids[-1]) + 1 if buffer.size and buffer[-1] != ord('\n') else int(np.sum(buffer == ord('\n')))
+    priorities = BYTE_PRIORITIES[buffer]
+    items = priorities > 0
+    priorities, line_ids = priorities[items], line_ids[items]
+    lengths = np.bincount(line_ids, minlength=lines)
+    starts = np.cumsum(lengths) - lengths
+    in_left = np.arange(line_ids.size) - starts[line_ids] < lengths[line_ids] // 2
+    left = np.zeros((lines, 53), dtype=bool)
+    right = np.zeros((lines, 53), dtype=bool)
+    left[line_ids[in_left], priorities[in_left]] = True
+    right[line_ids[~in_left], priorities[~in_left]] = True
+    return left, right
+
+
+def day03_vectorized(filename: str = 'day03input.txt') -> Tuple[int, int]:
+    with open(filename, 'rb') as f:
+        left, right = presence_matrices(f.read())
+    compartments = np.logical_and(left, right) @ PRIORITIES
+    packs = np.logical_or(left, right)
+    whole = packs.shape[0] // 3 * 3
+    badges = np.logical_and.reduce(packs[:whole].reshape(-1, 3, 53), axis=1).argmax(axis=1)
+    partial = np.logical_and.reduce(packs[whole:], axis=0) @ PRIORITIES if packs.shape[0] > whole else 0
+    return int(compartments.sum()), int(badges.sum() + partial)
+
+
 def day03_2():
-    results = []
-    with open('day03input.txt') as f:
-        for lines in chunked(f, 3):
-            sets = [set(line.strip()) for line in lines]
-            results.append(reduce(lambda x, y: x & y, sets))
-    return sum(map(char_to_priority, chain.from_iterable(results)))
+    return day03()[1]
 
 
 def day03_1():
-    results = []
-    with open('day03input.txt') as f:
-        for line in f:
-            results.append(common_chars(*halve(line.strip())))
-    return sum(map(char_to_priority, chain.from_iterable(results)))
+    return day03()[0]
 
 
 if __name__ == '__main__':
@@ -1,5 +1,11 @@
+import re
 from typing import Tuple
 
+import numpy as np
+from numpy.typing import NDArray
+
+number_pattern = re.compile(rb'\d+')
+
 
 def contains(pairs: Tuple[Tuple[int, int], Tuple[int, int]]) -> bool:
     a, b = pairs
@@ -11,26 +17,64 @@ def overlaps(pairs: Tuple[Tuple[int, int], Tuple[int, int]]) -> bool:
     return not (a[0] > b[1] or b[0] > a[1])
 
 
+def read_assignments(filename: str = 'day04input.txt') -> NDArray[np.int64]:
+    with open(filename, 'rb') as f:
+        numbers = np.fromiter(map(int, number_pattern.findall(f.read())), dtype=np.int64)
+    pairs = numbers.reshape(-1, 2, 2)
+    return np.sort(pairs, axis=2).reshape(-1, 4)
+
+
+def contains_all(assignments: NDArray[np.int64]) -> NDArray[bool]:
+    a0, a1, b0, b1 = assignments.T
+    return ((a0 >= b0) & (a1 <= b1)) | ((b0 >= a0) & (b1 <= a1))
+
+
+def overlaps_all(assignments: NDArray[np.int64]) -> NDArray[bool]:
+    a0, a1, b0, b1 = assignments.T
+    return (a0 <= b1) & (b0 <= a1)
+
+
+class SectionIndex:
+    def __init__(self, ranges: NDArray[np.int64]):
+        self.ranges = ranges
+        self.order = np.argsort(ranges[:, 0], kind='stable')
+        self.starts = ranges[self.order, 0]
+        self.ends_by_start = ranges[self.order, 1]
+        self.ends = np.sort(ranges[:, 1])
+
+    def __len__(self) -> int:
+        return len(self.ranges)
+
+    def count_overlapping(self, lo: int, hi: int) -> int:
+        ends_before = np.searchsorted(self.ends, lo, side='left')
+        starts_after = len(self) - np.searchsorted(self.starts, hi, side='right')
+        return int(len(self) - ends_before - starts_after)
+
+    def covering(self, lo: int, hi: int) -> NDArray[np.int64]:
+        started = np.searchsorted(self.starts, lo, side='right')
+        return np.sort(self.order[:started][self.ends_by_start[:started] >= hi])
+
+    def count_overlapping_pairs(self) -> int:
+        n = len(self)
+        disjoint = n - np.searchsorted(self.starts, self.ranges[:, 1], side='right')
+        return n * (n - 1) // 2 - int(disjoint.sum())
+
+
+def section_index(assignments: NDArray[np.int64]) -> SectionIndex:
+    return SectionIndex(assignments.reshape(-1, 2))
+
+
+def day04() -> Tuple[int, int]:
+    assignments = read_assignments()
+    return int(contains_all(assignments).sum()), int(overlaps_all(assignments).sum())
+
+
 def day04_2():
-    with open('day04input.txt') as f:
-        results = [
-            x for line in f
-            if overlaps(x := tuple([
-                tuple(sorted(map(int, r.split('-')))) for r in line.strip().split(',')
-            ]))
-        ]
-    return len(results)
+    return day04()[1]
 
 
 def day04_1():
-    with open('day04input.txt') as f:
-        results = [
-            x for line in f
-            if contains(x := tuple([
-                tuple(sorted(map(int, r.split('-')))) for r in line.strip().split(',')
-            ]))
-        ]
-    return len(results)
+    return day04()[0]
 
 
 if __name__ == '__main__':
@@ -1,56 +1,137 @@
+from __future__ import annotations
 import re
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Tuple, TextIO, Iterator
 
 pattern = re.compile(r'move (?P<num>\d+) from (?P<source>\d+) to (?P<target>\d+)')
 
 
-def day05_1():
+class Step(NamedTuple):
+    num: int
+    source: str
+    target: str
+
+
+class Chunk(NamedTuple):
+    crates: Tuple[str, ...]
+    start: int
+    stop: int
+    flipped: bool = False
+
+    @property
+    def size(self) -> int:
+        return self.stop - self.start
+
+    def top(self) -> str:
+        return self.crates[self.start] if self.flipped else self.crates[self.stop - 1]
+
+    def split(self, num: int) -> Tuple[Chunk, Chunk]:
+        if self.flipped:
+            return (Chunk(self.crates, self.start + num, self.stop, True),
+                    Chunk(self.crates, self.start, self.start + num, True))
+        return (Chunk(self.crates, self.start, self.stop - num),
+                Chunk(self.crates, self.stop - num, self.stop))
+
+    def flip(self) -> Chunk:
+        return self._replace(flipped=not self.flipped)
+
+    def bottom_up(self) -> Iterator[str]:
+        crates = self.crates[self.start:self.stop]
+        return reversed(crates) if self.flipped else iter(crates)
+
+
+class CrateStack:
+    def __init__(self, crates: List[str]):
+        self.chunks: List[Chunk] = [Chunk(tuple(crates), 0, len(crates))] if crates else []
+        self.size = len(crates)
+
+    def take(self, num: int, one_at_a_time: bool = False) -> List[Chunk]:
+        taken: List[Chunk] = []
+        self.size -= num
+        while num:
+            chunk = self.chunks.pop()
+            if chunk.size > num:
+                rest, chunk = chunk.split(num)
+                self.chunks.append(rest)
+            taken.append(chunk)
+            num -= chunk.size
+        if one_at_a_time:
+            return [chunk.flip() for chunk in taken]
+        taken.reverse()
+        return taken
+
+    def put(self, chunks: List[Chunk]) -> None:
+        self.chunks.extend(chunks)
+        self.size += sum(chunk.size for chunk in chunks)
+
+    def top(self) -> str:
+        return self.chunks[-1].top() if self.chunks else ''
+
+    def crates(self) -> List[str]:
+        return [crate for chunk in self.chunks for crate in chunk.bottom_up()]
+
+
+def read_stacks(f: TextIO) -> Dict[str, List[str]]:
     stacks = []
-    state: Dict[str, List[str]]
+    while True:
+        line = f.readline().rstrip()
+        if line.startswith(' 1 '):
+            key_line = line
+            stacks.reverse()
+            return {
+                stack: [c for l in stacks if len(l) > pos and (c := l[pos]) != ' ']
+                for pos, stack in enumerate(key_line) if stack != ' '
+            }
+        stacks.append(line)
+
+
+def read_steps(f: TextIO) -> Iterator[Step]:
+    for line in f:
+        if match := pattern.fullmatch(line.strip()):
+            yield Step(int(match.groupdict()['num']), match.groupdict()['source'], match.groupdict()['target'])
+
+
+def run_crane(one_at_a_time: bool) -> str:
     with open('day05input.txt') as f:
-        while True:
-            line = f.readline().rstrip()
-            if line.startswith(' 1 '):
-                key_line = line
-                stacks.reverse()
-                state = {
-                    stack: [c for l in stacks if len(l) > pos and (c := l[pos]) != ' ']
-                    for pos, stack in enumerate(key_line) if stack != ' '
-                }
-                break
-            stacks.append(line)
-        for line in f:
-            if match := pattern.fullmatch(line.strip()):
-                for _ in range(int(match.groupdict()['num'])):
-                    crate = state[match.groupdict()['source']].pop()
-                    state[match.groupdict()['target']].append(crate)
-    return ''.join([c[-1] for c in state.values()])
+        state = {name: CrateStack(crates) for name, crates in read_stacks(f).items()}
+        for step in read_steps(f):
+            state[step.target].put(state[step.source].take(step.num, one_at_a_time))
+    return ''.join([stack.top() for stack in state.values()])
 
 
-def day05_2():
-    stacks = []
-    state: Dict[str, List[str]]
+def trace_tops(stacks: Dict[str, List[str]], steps: List[Step], one_at_a_time: bool) -> str:
+    heights = {name: len(crates) for name, crates in stacks.items()}
+    for step in steps:
+        heights[step.source] -= step.num
+        heights[step.target] += step.num
+    tracked = {name: (name, height - 1) for name, height in heights.items() if height}
+    for step in reversed(steps):
+        target_base = heights[step.target] - step.num
+        heights[step.target] -= step.num
+        heights[step.source] += step.num
+        source_base = heights[step.source] - step.num
+        for name, (stack, index) in tracked.items():
+            if stack == step.target and index >= target_base:
+                offset = index - target_base
+                if one_at_a_time:
+                    offset = step.num - 1 - offset
+                tracked[name] = (step.source, source_base + offset)
+    return ''.join([stacks[stack][index] for stack, index in tracked.values()])
+
+
+def run_trace(one_at_a_time: bool) -> str:
     with open('day05input.txt') as f:
-        while True:
-            line = f.readline().rstrip()
-            if line.startswith(' 1 '):
-                key_line = line
-                stacks.reverse()
-                state = {
-                    stack: [c for l in stacks if len(l) > pos and (c := l[pos]) != ' ']
-                    for pos, stack in enumerate(key_line) if stack != ' '
-                }
-                break
-            stacks.append(line)
-        for line in f:
-            if match := pattern.fullmatch(line.strip()):
-                num = int(match.groupdict()['num'])
-                crates = state[match.groupdict()['source']][-num:]
-                state[match.groupdict()['source']] = state[match.groupdict()['source']][:-num]
-                state[match.groupdict()['target']].extend(crates)
-
-    return ''.join([c[-1] for c in state.values()])
+        stacks = read_stacks(f)
+        steps = list(read_steps(f))
+    return trace_tops(stacks, steps, one_at_a_time)
+
+
+def day05_1():
+    return run_crane(one_at_a_time=True)
+
+
+def day05_2():
+    return run_crane(one_at_a_time=False)
 
 
 if __name__ == '__main__':
-    print(day05_2())
\ No newline at end of file
+    print(day05_2())
@@ -1,24 +1,85 @@
+from typing import Dict, Iterable, Iterator, Tuple, BinaryIO
+
+
+class MarkerDetector:
+    def __init__(self, sizes: Iterable[int]):
+        self.pending = sorted(set(sizes))
+        self.last_seen = [-1] * 256
+        self.start = 0
+        self.offset = 0
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def feed(self, chunk: bytes) -> Iterator[Tuple[int, int]]:
+        last_seen = self.last_seen
+        start = self.start
+        for i, byte in enumerate(chunk, self.offset):
+            if last_seen[byte] >= start:
+                start = last_seen[byte] + 1
+            last_seen[byte] = i
+            while self.pending and i - start + 1 >= self.pending[0]:
+                yield self.pending.pop(0), i + 1
+            if not self.pending:
+                break
+        self.start = start
+        self.offset += len(chunk)
+
+
+def read_chunks(stream: BinaryIO, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    while chunk := stream.read(chunk_size):
+        yield chunk
+
+
+def strip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    held = b''
+    started = False
+    for chunk in chunks:
+        if not started:
+            chunk = chunk.lstrip()
+            started = bool(chunk)
+        body = chunk.rstrip()
+        if body:
+            if held:
+                yield held
+            yield body
+            held = chunk[len(body):]
+        else:
+            held += chunk
+
+
+def stream_markers(chunks: Iterable[bytes], sizes: Iterable[int]) -> Iterator[Tuple[int, int]]:
+    detector = MarkerDetector(sizes)
+    for chunk in strip_chunks(chunks):
+        yield from detector.feed(chunk)
+        if detector.done:
+            return
+
+
+def find_markers(seq: bytes, sizes: Iterable[int]) -> Dict[int, int]:
+    markers = {size: 0 for size in sizes}
+    markers.update(stream_markers([seq], markers))
+    return markers
+
+
+def scan_signal(sizes: Iterable[int]) -> Dict[int, int]:
+    markers = {size: 0 for size in sizes}
+    with open('day06input.txt', 'rb') as f:
+        markers.update(stream_markers(read_chunks(f), markers))
+    return markers
+
+
+def day06() -> Dict[int, int]:
+    return scan_signal([4, 14])
+
+
 def day06_1():
-    with open('day06input.txt') as f:
-        seq = f.read().strip()
-    #seq = 'zcfzfwzzqfrljwzlrfnpqdbhtmscgvjw'
-    for i in range(4, len(seq)):
-        last4 = seq[i - 4:i]
-        unique = set(last4)
-        if len(unique) == 4:
-            return i
-    return 0
+    return scan_signal([4])[4]
 
 
 def day06_2():
-    with open('day06input.txt') as f:
-        seq = f.read().strip()
-    for i in range(14, len(seq)):
-        last14 = seq[i - 14:i]
-        unique = set(last14)
-        if len(unique) == 14:
-            return i
-    return 0
+    return scan_signal([14])[14]
 
 
 if __name__ == '__main__':
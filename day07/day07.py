@@ -1,11 +1,12 @@
 from __future__ import annotations
+from array import array
 from functools import reduce
 from operator import getitem, itemgetter, attrgetter
 import re
 from pathlib import PurePosixPath
 from pprint import pprint
-from typing import Dict, Union, Tuple, List, NamedTuple
-from dataclasses import dataclass
+from typing import Dict, Union, Tuple, List, NamedTuple, Optional, Iterable
+from dataclasses import dataclass, field
 
 from more_itertools import partition
 
@@ -14,19 +15,35 @@ dir_pattern = re.compile(r'dir (?P<dir>\S+)')
 file_pattern = re.compile(r'(?P<size>\d+) (?P<name>\S+)')
 
 
+def node_path(node: Union[Directory, File]) -> PurePosixPath:
+    names = []
+    while node.parent is not None:
+        names.append(node.name)
+        node = node.parent
+    return PurePosixPath('/', *reversed(names))
+
+
 @dataclass
 class File:
-    path: PurePosixPath
     name: str
     size: int
+    parent: Optional[Directory] = field(default=None, repr=False, compare=False)
+
+    @property
+    def path(self) -> PurePosixPath:
+        return node_path(self)
 
 
 @dataclass
 class Directory:
-    path: PurePosixPath
     name: str
     children: Dict[str, Union[Directory, File]]
     size: int = 0
+    parent: Optional[Directory] = field(default=None, repr=False, compare=False)
+
+    @property
+    def path(self) -> PurePosixPath:
+        return node_path(self)
 
 
 def get_by_path(root: Directory, path: List[str]) -> Union[Directory, File, None]:
@@ -38,61 +55,275 @@ def get_by_path(root: Directory, path: List[str]) -> Union[Directory, File, None
 
 
 def build_fs():
-    root = Directory(PurePosixPath('/'), '/', {})
-    path = []
-    current: Directory
+    root = Directory('/', {})
+    current = root
     with open('day07input.txt') as f:
         for line in f:
             line = line.strip()
             if line == '$ ls':
-                current = get_by_path(root, path)
+                continue
             elif line.startswith('$ cd'):
                 if match := cd_pattern.fullmatch(line):
                     directory = match.groupdict()['dir']
                     if directory == '/':
-                        path = ['/']
+                        current = root
                     elif directory == '..':
-                        path = path[:-1]
+                        current = current.parent or root
                     else:
-                        path.append(directory)
+                        child = current.children.get(directory)
+                        if not isinstance(child, Directory):
+                            child = current.children[directory] = Directory(directory, {}, parent=current)
+                        current = child
             else:
                 if match := dir_pattern.fullmatch(line):
                     name = match.groupdict()['dir']
-                    current.children[name] = Directory(current.path / name, name, {})
+                    if not isinstance(current.children.get(name), Directory):
+                        current.children[name] = Directory(name, {}, parent=current)
                 elif match := file_pattern.fullmatch(line):
                     name = match.groupdict()['name']
                     size = int(match.groupdict()['size'])
-                    current.children[name] = File(current.path / name, name, size)
+                    current.children[name] = File(name, size, parent=current)
     return root
 
 
 def compute_sizes(directory: Directory) -> Directory:
-    for child in directory.children.values():
-        if type(child) == Directory:
-            compute_sizes(child)
-    total = sum(map(attrgetter('size'), directory.children.values()))
-    directory.size = total
+    stack: List[Tuple[Directory, bool]] = [(directory, False)]
+    while stack:
+        current, visited = stack.pop()
+        if visited:
+            current.size = sum(map(attrgetter('size'), current.children.values()))
+        else:
+            stack.append((current, True))
+            stack.extend((child, False) for child in current.children.values() if isinstance(child, Directory))
     return directory
 
 
 def get_all_dirs(root: Directory) -> List[Directory]:
     all_dirs: List[Directory] = []
-
-    def __get_dirs(item: Union[Directory, File]):
+    stack: List[Union[Directory, File]] = [root]
+    while stack:
+        item = stack.pop()
         if isinstance(item, Directory):
             all_dirs.append(item)
-            for child in item.children.values():
-                __get_dirs(child)
+            stack.extend(reversed(item.children.values()))
+    return all_dirs
 
-    __get_dirs(root)
 
-    return all_dirs
+class SizeIndex:
+    def __init__(self, dirs: Iterable[Directory] = ()):
+        self.capacity = 1
+        self.counts: Dict[int, int] = {}
+        self.totals: Dict[int, int] = {}
+        self.by_size: Dict[int, Dict[int, Directory]] = {}
+        self.slots: Dict[int, int] = {}
+        for directory in dirs:
+            self.add(directory)
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def _update(self, size: int, count: int) -> None:
+        index = size + 1
+        while index > self.capacity:
+            self.counts[self.capacity * 2] = self.counts.get(self.capacity, 0)
+            self.totals[self.capacity * 2] = self.totals.get(self.capacity, 0)
+            self.capacity *= 2
+        while index <= self.capacity:
+            self.counts[index] = self.counts.get(index, 0) + count
+            self.totals[index] = self.totals.get(index, 0) + count * size
+            index += index & -index
+
+    def _prefix(self, tree: Dict[int, int], limit: int) -> int:
+        index = min(limit + 1, self.capacity)
+        result = 0
+        while index > 0:
+            result += tree.get(index, 0)
+            index -= index & -index
+        return result
+
+    def add(self, directory: Directory) -> None:
+        self.slots[id(directory)] = directory.size
+        self.by_size.setdefault(directory.size, {})[id(directory)] = directory
+        self._update(directory.size, 1)
+
+    def discard(self, directory: Directory) -> None:
+        if (size := self.slots.pop(id(directory), None)) is None:
+            return
+        same_size = self.by_size[size]
+        del same_size[id(directory)]
+        if not same_size:
+            del self.by_size[size]
+        self._update(size, -1)
+
+    def resize(self, directory: Directory) -> None:
+        self.discard(directory)
+        self.add(directory)
+
+    def total_at_most(self, limit: int) -> int:
+        return self._prefix(self.totals, limit)
+
+    def smallest_at_least(self, limit: int) -> Optional[Directory]:
+        remaining = self._prefix(self.counts, limit - 1)
+        if remaining >= len(self):
+            return None
+        index = 0
+        step = self.capacity
+        while step:
+            if index + step <= self.capacity and self.counts.get(index + step, 0) <= remaining:
+                index += step
+                remaining -= self.counts.get(index, 0)
+            step //= 2
+        return next(iter(self.by_size[index].values()))
+
+
+class LiveFS:
+    def __init__(self):
+        self.root = Directory('/', {})
+        self.current = self.root
+        self.index = SizeIndex([self.root])
+
+    def _propagate(self, directory: Optional[Directory], delta: int) -> None:
+        while directory is not None and delta:
+            directory.size += delta
+            self.index.resize(directory)
+            directory = directory.parent
+
+    def add_directory(self, parent: Directory, name: str) -> Directory:
+        existing = parent.children.get(name)
+        if isinstance(existing, Directory):
+            return existing
+        if existing is not None:
+            self.remove(parent, name)
+        directory = parent.children[name] = Directory(name, {}, parent=parent)
+        self.index.add(directory)
+        return directory
+
+    def add_file(self, parent: Directory, name: str, size: int) -> File:
+        if name in parent.children:
+            self.remove(parent, name)
+        file = parent.children[name] = File(name, size, parent=parent)
+        self._propagate(parent, size)
+        return file
+
+    def remove(self, parent: Directory, name: str) -> None:
+        node = parent.children.pop(name)
+        if isinstance(node, Directory):
+            for directory in get_all_dirs(node):
+                self.index.discard(directory)
+        self._propagate(parent, -node.size)
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        if line.startswith('$ cd'):
+            if match := cd_pattern.fullmatch(line):
+                directory = match.groupdict()['dir']
+                if directory == '/':
+                    self.current = self.root
+                elif directory == '..':
+                    self.current = self.current.parent or self.root
+                else:
+                    self.current = self.add_directory(self.current, directory)
+        elif match := dir_pattern.fullmatch(line):
+            self.add_directory(self.current, match.groupdict()['dir'])
+        elif match := file_pattern.fullmatch(line):
+            self.add_file(self.current, match.groupdict()['name'], int(match.groupdict()['size']))
+
+    def feed_all(self, lines: Iterable[str]) -> LiveFS:
+        for line in lines:
+            self.feed(line)
+        return self
+
+
+class ColumnarFS:
+    def __init__(self):
+        self.parent = array('q', [-1])
+        self.size = array('q', [0])
+        self.is_dir = bytearray(b'\x01')
+        self.listed = bytearray(b'\x00')
+        self.name = array('q', [0])
+        self.names: List[str] = ['/']
+        self.name_ids: Dict[str, int] = {'/': 0}
+        self.subdirs: Dict[Tuple[int, int], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def intern(self, name: str) -> int:
+        if (name_id := self.name_ids.get(name)) is None:
+            name_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def child(self, parent: int, name: str) -> Optional[int]:
+        if (name_id := self.name_ids.get(name)) is None:
+            return None
+        return self.subdirs.get((parent, name_id))
+
+    def add(self, parent: int, name: str, size: int = 0, is_dir: bool = False) -> int:
+        name_id = self.intern(name)
+        if is_dir and (node := self.subdirs.get((parent, name_id))) is not None:
+            return node
+        node = len(self)
+        if is_dir:
+            self.subdirs[parent, name_id] = node
+        self.parent.append(parent)
+        self.size.append(size)
+        self.is_dir.append(is_dir)
+        self.listed.append(False)
+        self.name.append(name_id)
+        return node
+
+    def path(self, node: int) -> PurePosixPath:
+        names = []
+        while node > 0:
+            names.append(self.names[self.name[node]])
+            node = self.parent[node]
+        return PurePosixPath('/', *reversed(names))
+
+    def compute_sizes(self) -> ColumnarFS:
+        parent, size, is_dir = self.parent, self.size, self.is_dir
+        for node in range(len(self)):
+            if is_dir[node]:
+                size[node] = 0
+        for node in range(len(self) - 1, 0, -1):
+            size[parent[node]] += size[node]
+        return self
+
+    def dirs(self) -> List[int]:
+        return [node for node, flag in enumerate(self.is_dir) if flag]
+
+
+def build_columnar_fs(filename: str = 'day07input.txt') -> ColumnarFS:
+    fs = ColumnarFS()
+    current = 0
+    listing = False
+    with open(filename) as f:
+        for line in f:
+            line = line.strip()
+            if line == '$ ls':
+                listing = not fs.listed[current]
+                fs.listed[current] = True
+            elif line.startswith('$ cd'):
+                listing = False
+                if match := cd_pattern.fullmatch(line):
+                    directory = match.groupdict()['dir']
+                    if directory == '/':
+                        current = 0
+                    elif directory == '..':
+                        current = max(fs.parent[current], 0)
+                    else:
+                        current = fs.add(current, directory, is_dir=True)
+            elif not listing:
+                continue
+            elif match := dir_pattern.fullmatch(line):
+                fs.add(current, match.groupdict()['dir'], is_dir=True)
+            elif match := file_pattern.fullmatch(line):
+                fs.add(current, match.groupdict()['name'], int(match.groupdict()['size']))
+    return fs
 
 
 def day07_1() -> int:
-    all_dirs = get_all_dirs(compute_sizes(build_fs()))
-    at_most_100000 = [size for directory in all_dirs if (size := directory.size) <= 100000]
-    return sum(at_most_100000)
+    return SizeIndex(get_all_dirs(compute_sizes(build_fs()))).total_at_most(100000)
 
 
 def day07_2():
@@ -103,8 +334,7 @@ def day07_2():
     current_free = capacity - used
     need_to_free = needed_free - current_free
     pad = len(f'{capacity:,d}')
-    at_least_needed = sorted([d for d in get_all_dirs(root) if d.size >= need_to_free], key=attrgetter('size'))
-    to_be_deleted = at_least_needed[0]
+    to_be_deleted = SizeIndex(get_all_dirs(root)).smallest_at_least(need_to_free)
     text_pad = max(len(str(to_be_deleted.path)), len('Size of disk'))
     return f'{"Size of disk":{text_pad}s}: {capacity:{pad},d}\n' \
            f'{"Current Free":{text_pad}s}: {current_free:{pad},d}\n' \
@@ -1,9 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from itertools import takewhile
-from typing import List, TypeVar, Generic, Tuple, Callable
+from typing import List, TypeVar, Generic, Tuple, Callable, Mapping
 
+import numpy as np
 from more_itertools import partition, flatten
+from numpy.typing import NDArray
 
 T = TypeVar("T")
 U = TypeVar("U")
@@ -54,6 +56,75 @@ def get_grid() -> Grid:
     return grid
 
 
+def get_heights() -> NDArray[int]:
+    with open('day08input.txt', 'rb') as f:
+        rows = f.read().split()
+    return np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), -1).astype(int) - ord('0')
+
+
+def _tallest_before(heights: NDArray[int]) -> NDArray[int]:
+    before = np.full(heights.shape, -1, dtype=np.int64)
+    before[:, 1:] = np.maximum.accumulate(heights, axis=1)[:, :-1]
+    return before
+
+
+def _row_visible(heights: NDArray[int]) -> NDArray[bool]:
+    return (heights > _tallest_before(heights)) | (heights > _tallest_before(heights[:, ::-1])[:, ::-1])
+
+
+def visible_grid(heights: NDArray[int]) -> NDArray[bool]:
+    return _row_visible(heights) | _row_visible(heights.T).T
+
+
+def _view_before(heights: NDArray[int]) -> NDArray[int]:
+    distances = np.empty(heights.shape, dtype=np.int64)
+    for r, row in enumerate(heights.tolist()):
+        stack: List[int] = []
+        row_distances = []
+        for j, height in enumerate(row):
+            while stack and row[stack[-1]] < height:
+                stack.pop()
+            row_distances.append(j - stack[-1] if stack else j)
+            stack.append(j)
+        distances[r] = row_distances
+    return distances
+
+
+def _row_scores(heights: NDArray[int]) -> NDArray[int]:
+    return _view_before(heights) * _view_before(heights[:, ::-1])[:, ::-1]
+
+
+def scenic_grid(heights: NDArray[int]) -> NDArray[int]:
+    return _row_scores(heights) * _row_scores(heights.T).T
+
+
+class TreeGrid:
+    def __init__(self, heights: NDArray[int]):
+        self.heights = np.array(heights)
+        self.row_visible = _row_visible(self.heights)
+        self.col_visible = _row_visible(self.heights.T).T.copy()
+        self.row_scores = _row_scores(self.heights)
+        self.col_scores = _row_scores(self.heights.T).T.copy()
+        self.visible = self.row_visible | self.col_visible
+        self.scores = self.row_scores * self.col_scores
+
+    def update(self, edits: Mapping[Tuple[int, int], int]) -> None:
+        if not edits:
+            return
+        for (x, y), height in edits.items():
+            self.heights[y, x] = height
+        rows = sorted({y for _x, y in edits})
+        cols = sorted({x for x, _y in edits})
+        self.row_visible[rows] = _row_visible(self.heights[rows])
+        self.row_scores[rows] = _row_scores(self.heights[rows])
+        self.col_visible[:, cols] = _row_visible(self.heights[:, cols].T).T
+        self.col_scores[:, cols] = _row_scores(self.heights[:, cols].T).T
+        self.visible[rows] = self.row_visible[rows] | self.col_visible[rows]
+        self.scores[rows] = self.row_scores[rows] * self.col_scores[rows]
+        self.visible[:, cols] = self.row_visible[:, cols] | self.col_visible[:, cols]
+        self.scores[:, cols] = self.row_scores[:, cols] * self.col_scores[:, cols]
+
+
 def is_visible(grid: Grid, x: int, y: int) -> bool:
     cell = grid.get_cell(x, y)
     for direction in grid.get_between(x, y):
@@ -81,18 +152,15 @@ def view_score(grid: Grid, x: int, y: int) -> int:
 
 
 def day08_1():
-    grid = get_grid()
-    visible_grid = grid.grid_map(is_visible)
-    printable_grid = visible_grid.grid_map(lambda g, x, y: 'T' if g.get_cell(x, y) else 'F')
-    print(printable_grid.to_mls())
-    return len(list(filter(None, visible_grid.get_all_cells())))
+    visible = visible_grid(get_heights())
+    print('\n'.join([' '.join(row) for row in np.where(visible, 'T', 'F')]))
+    return int(visible.sum())
 
 
 def day08_2():
-    grid = get_grid()
-    scored_grid = grid.grid_map(view_score)
-    print(scored_grid.to_mls())
-    return max(scored_grid.get_all_cells())
+    scores = scenic_grid(get_heights())
+    print(Grid(scores.tolist()).to_mls())
+    return int(scores.max())
 
 
 if __name__ == '__main__':
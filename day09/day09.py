@@ -1,9 +1,10 @@
 from __future__ import annotations
 from enum import Enum
 import re
-from typing import NamedTuple, List, Set
+from typing import NamedTuple, List, Set, Dict, Iterable, Iterator, Tuple, Union
 
-from more_itertools import flatten
+import numpy as np
+from numpy.typing import NDArray
 
 move_pattern = re.compile(r'(?P<direction>[UDLR]) (?P<spaces>\d+)')
 
@@ -48,13 +49,15 @@ class Move(NamedTuple):
     distance: int
 
 
+def read_moves(filename: str = 'day09input.txt') -> Iterator[Move]:
+    with open(filename) as f:
+        for line in f:
+            if m := move_pattern.fullmatch(line.strip()):
+                yield Move(Direction[m.groupdict()['direction']], int(m.groupdict()['spaces']))
+
+
 def get_moves() -> List[Move]:
-    with open('day09input.txt') as f:
-        moves = [
-            Move(Direction[m.groupdict()['direction']], int(m.groupdict()['spaces']))
-            for line in f if (m := move_pattern.fullmatch(line.strip()))
-        ]
-    return moves
+    return list(read_moves())
 
 
 def render_state(min_x: int, max_x: int, min_y: int, max_y: int, start: Position, hp: Position, tp: Position) -> str:
@@ -86,7 +89,8 @@ def move_tail(tail_position: Position, head_position: Position) -> Position:
     return Position(tail_position.x + __scale(vec.x), tail_position.y + __scale(vec.y))
 
 
-def render_visited(min_x: int, max_x: int, min_y: int, max_y: int, start: Position, tails: Set[Position]) -> str:
+def render_visited(min_x: int, max_x: int, min_y: int, max_y: int, start: Position,
+                   tails: Union[Set[Position], VisitedMap]) -> str:
     def __char(p: Position) -> str:
         if p == start:
             return 'S'
@@ -116,61 +120,227 @@ def render_long_tail(min_x: int, max_x: int, min_y: int, max_y: int, start: Posi
     return '\n'.join(rows)
 
 
-def day09_1():
-    moves = get_moves()
-    start = Position(0, 0)
-    head_position = start
-    tail_position = start
-    head_positions = [start]
-    tail_positions = []
+TILE_SIZE = 64
+
+
+class VisitedMap:
+    def __init__(self, positions: Iterable[Position] = ()):
+        self.tiles: Dict[Tuple[int, int], NDArray[np.uint64]] = {}
+        self.count = 0
+        for position in positions:
+            self.add(position)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, position: Position) -> bool:
+        tx, lx = divmod(position.x, TILE_SIZE)
+        ty, ly = divmod(position.y, TILE_SIZE)
+        tile = self.tiles.get((tx, ty))
+        return tile is not None and bool(int(tile[ly]) >> lx & 1)
+
+    def __iter__(self) -> Iterator[Position]:
+        for (tx, ty), tile in self.tiles.items():
+            for ly, row in enumerate(tile.tolist()):
+                while row:
+                    bit = row & -row
+                    yield Position(tx * TILE_SIZE + bit.bit_length() - 1, ty * TILE_SIZE + ly)
+                    row ^= bit
+
+    def _tile(self, tx: int, ty: int) -> NDArray[np.uint64]:
+        if (tile := self.tiles.get((tx, ty))) is None:
+            tile = self.tiles[tx, ty] = np.zeros(TILE_SIZE, dtype=np.uint64)
+        return tile
+
+    def add(self, position: Position) -> None:
+        tx, lx = divmod(position.x, TILE_SIZE)
+        ty, ly = divmod(position.y, TILE_SIZE)
+        tile = self._tile(tx, ty)
+        row = int(tile[ly])
+        if not row >> lx & 1:
+            tile[ly] = row | 1 << lx
+            self.count += 1
+
+    def _fill_row(self, tx: int, ty: int, ly: int, lo: int, hi: int) -> None:
+        tile = self._tile(tx, ty)
+        row = int(tile[ly])
+        mask = ((1 << (hi - lo + 1)) - 1) << lo
+        self.count += (mask & ~row).bit_count()
+        tile[ly] = row | mask
+
+    def _fill_column(self, tx: int, ty: int, lx: int, lo: int, hi: int) -> None:
+        rows = self._tile(tx, ty)[lo:hi + 1]
+        bit = np.uint64(1 << lx)
+        self.count += int(np.count_nonzero((rows & bit) == 0))
+        rows |= bit
+
+    def add_segment(self, start: Position, dx: int, dy: int, steps: int) -> None:
+        if steps <= 0:
+            return
+        if dx and dy:
+            for j in range(1, steps + 1):
+                self.add(Position(start.x + dx * j, start.y + dy * j))
+            return
+        if dx:
+            lo, hi = sorted((start.x + dx, start.x + dx * steps))
+            ty, ly = divmod(start.y, TILE_SIZE)
+            for tx in range(lo // TILE_SIZE, hi // TILE_SIZE + 1):
+                base = tx * TILE_SIZE
+                self._fill_row(tx, ty, ly, max(lo - base, 0), min(hi - base, TILE_SIZE - 1))
+        else:
+            lo, hi = sorted((start.y + dy, start.y + dy * steps))
+            tx, lx = divmod(start.x, TILE_SIZE)
+            for ty in range(lo // TILE_SIZE, hi // TILE_SIZE + 1):
+                base = ty * TILE_SIZE
+                self._fill_column(tx, ty, lx, max(lo - base, 0), min(hi - base, TILE_SIZE - 1))
+
+    def add_points(self, xs: NDArray[np.int64], ys: NDArray[np.int64]) -> None:
+        if not len(xs):
+            return
+        tx, lx = np.divmod(xs, TILE_SIZE)
+        ty, ly = np.divmod(ys, TILE_SIZE)
+        keys, inverse = np.unique(np.stack([tx, ty], axis=1), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(keys) + 1))
+        cells = (ly * TILE_SIZE + lx)[order]
+        for (key_x, key_y), lo, hi in zip(keys.tolist(), bounds[:-1], bounds[1:]):
+            tile = self._tile(key_x, key_y)
+            rows, cols = np.divmod(np.unique(cells[lo:hi]), TILE_SIZE)
+            bits = np.left_shift(np.uint64(1), cols.astype(np.uint64))
+            self.count += int(np.count_nonzero((tile[rows] & bits) == 0))
+            touched, starts = np.unique(rows, return_index=True)
+            tile[touched] |= np.bitwise_or.reduceat(bits, starts)
+
+
+class RopeSimulation:
+    def __init__(self, knots: int = 2, tracked: Iterable[int] = (-1,), start: Position = Position(0, 0)):
+        self.start = start
+        self.knots = [start] * knots
+        self.visited: Dict[int, VisitedMap] = {i % knots: VisitedMap([start]) for i in tracked}
+        self.min_x = self.max_x = start.x
+        self.min_y = self.max_y = start.y
+
+    @property
+    def bounds(self) -> Tuple[int, int, int, int]:
+        return self.min_x, self.max_x, self.min_y, self.max_y
+
+    def step(self, direction: Direction) -> None:
+        knots = self.knots
+        dx, dy = direction.value
+        head = knots[0] = Position(knots[0].x + dx, knots[0].y + dy)
+        self.min_x, self.max_x = min(self.min_x, head.x), max(self.max_x, head.x)
+        self.min_y, self.max_y = min(self.min_y, head.y), max(self.max_y, head.y)
+        for i in range(1, len(knots)):
+            moved = move_tail(knots[i], knots[i - 1])
+            if moved == knots[i]:
+                break
+            knots[i] = moved
+        for i, visited in self.visited.items():
+            visited.add(knots[i])
+
+    def _stretched(self, dx: int, dy: int) -> bool:
+        return all(knot.x == ahead.x - dx and knot.y == ahead.y - dy
+                   for ahead, knot in zip(self.knots, self.knots[1:]))
+
+    def _translate(self, dx: int, dy: int, steps: int) -> None:
+        for i, visited in self.visited.items():
+            visited.add_segment(self.knots[i], dx, dy, steps)
+        self.knots = [Position(knot.x + dx * steps, knot.y + dy * steps) for knot in self.knots]
+        head = self.knots[0]
+        self.min_x, self.max_x = min(self.min_x, head.x), max(self.max_x, head.x)
+        self.min_y, self.max_y = min(self.min_y, head.y), max(self.max_y, head.y)
+
+    def apply(self, move: Move) -> None:
+        dx, dy = move.direction.value
+        remaining = move.distance
+        while remaining:
+            if remaining > len(self.knots) and self._stretched(dx, dy):
+                self._translate(dx, dy, remaining)
+                return
+            self.step(move.direction)
+            remaining -= 1
+
+    def run(self, moves: Iterable[Move]) -> RopeSimulation:
+        for move in moves:
+            self.apply(move)
+        return self
+
+
+Trajectory = Tuple[NDArray[np.int64], NDArray[np.int64]]
+
+
+def _expand_steps(steps: List[Tuple[int, int, int]], x: int, y: int) -> Trajectory:
+    dx, dy, counts = np.array(steps, dtype=np.int64).T
+    return x + np.cumsum(np.repeat(dx, counts)), y + np.cumsum(np.repeat(dy, counts))
+
+
+def head_trajectory(moves: Iterable[Move], chunk_size: int = 1 << 16,
+                    start: Position = Position(0, 0)) -> Iterator[Trajectory]:
+    x, y = start
+    steps: List[Tuple[int, int, int]] = []
+    pending = 0
     for move in moves:
-        head_positions.extend(head_position.move(move))
-        head_position = head_positions[-1]
-    for hp in head_positions:
-        tail_position = move_tail(tail_position, hp)
-        tail_positions.append(tail_position)
-    x_vals = {p.x for p in head_positions}
-    y_vals = {p.y for p in head_positions}
-    min_x = min(x_vals)
-    max_x = max(x_vals)
-    min_y = min(y_vals)
-    max_y = max(y_vals)
-    tail_visits = set(tail_positions)
+        dx, dy = move.direction.value
+        remaining = move.distance
+        while remaining:
+            count = min(remaining, chunk_size - pending)
+            steps.append((dx, dy, count))
+            pending += count
+            remaining -= count
+            if pending == chunk_size:
+                xs, ys = _expand_steps(steps, x, y)
+                yield xs, ys
+                x, y = int(xs[-1]), int(ys[-1])
+                steps, pending = [], 0
+    if steps:
+        yield _expand_steps(steps, x, y)
+
+
+def follow_trajectory(leader: Iterable[Trajectory], start: Position = Position(0, 0)) -> Iterator[Trajectory]:
+    tx, ty = start
+    for xs, ys in leader:
+        out_x, out_y = [], []
+        for hx, hy in zip(xs.tolist(), ys.tolist()):
+            dx, dy = hx - tx, hy - ty
+            if dx > 1 or dx < -1 or dy > 1 or dy < -1:
+                tx += (dx > 0) - (dx < 0)
+                ty += (dy > 0) - (dy < 0)
+            out_x.append(tx)
+            out_y.append(ty)
+        yield np.array(out_x, dtype=np.int64), np.array(out_y, dtype=np.int64)
+
+
+def rope_trajectory(moves: Iterable[Move], knots: int, chunk_size: int = 1 << 16,
+                    start: Position = Position(0, 0)) -> Iterator[Trajectory]:
+    stream = head_trajectory(moves, chunk_size, start)
+    for _ in range(knots - 1):
+        stream = follow_trajectory(stream, start)
+    return stream
+
+
+def pipeline_visits(moves: Iterable[Move], knots: int, chunk_size: int = 1 << 16,
+                    start: Position = Position(0, 0)) -> VisitedMap:
+    visited = VisitedMap([start])
+    for xs, ys in rope_trajectory(moves, knots, chunk_size, start):
+        visited.add_points(xs, ys)
+    return visited
+
+
+def simulate_rope(knots: int) -> int:
+    rope = RopeSimulation(knots).run(read_moves())
+    tail_visits = rope.visited[knots - 1]
     print('\nTail Visited')
-    print(render_visited(min_x, max_x, min_y, max_y, start, tail_visits))
+    print(render_visited(*rope.bounds, rope.start, tail_visits))
     return len(tail_visits)
 
 
+def day09_1():
+    return simulate_rope(2)
+
+
 def day09_2():
-    moves = get_moves()
-    start = Position(0, 0)
-    positions = [[start for _i in range(10)]]
-    for move in moves:
-        heads = positions[-1][0].move(move)
-        for head in heads:
-            current = positions[-1]
-            new_positions = [head]
-            for p in current[1:]:
-                new_positions.append(move_tail(p, new_positions[-1]))
-            positions.append(new_positions)
-
-    x_vals = {p.x for p in flatten(positions)}
-    y_vals = {p.y for p in flatten(positions)}
-    min_x = min(x_vals)
-    max_x = max(x_vals)
-    min_y = min(y_vals)
-    max_y = max(y_vals)
-    if len(positions) < 1000:
-        for num, state in enumerate(positions):
-            if not num:
-                print('== Initiial State ==')
-            else:
-                print(f'\n== Step #{num:03d} ==')
-            print(render_long_tail(min_x, max_x, min_y, max_y, start, state))
-    tail_visits = set([p[-1] for p in positions])
-    print('\nTail Visited')
-    print(render_visited(min_x, max_x, min_y, max_y, start, tail_visits))
-    return len(tail_visits)
+    return simulate_rope(10)
 
 
 if __name__ == '__main__':
@@ -3,9 +3,11 @@ from __future__ import annotations
 from enum import IntEnum
 from itertools import accumulate, takewhile
 from operator import attrgetter
-from typing import NamedTuple, Optional, List, Tuple
+from typing import NamedTuple, Optional, List, Tuple, Dict, Callable, Iterable
 
-from more_itertools import flatten, chunked
+import numpy as np
+from more_itertools import flatten
+from numpy.typing import NDArray
 
 
 class Instruction(IntEnum):
@@ -39,21 +41,123 @@ def get_positions(ops: List[Op]) -> List[int]:
     return positions
 
 
+Registers = Dict[str, int]
+CycleHook = Callable[[int, Registers], None]
+
+
+class InstructionSpec(NamedTuple):
+    cycles: int
+    effect: Callable[[Registers, List[int]], None]
+
+
+def _noop(_registers: Registers, _args: List[int]) -> None:
+    pass
+
+
+def _addx(registers: Registers, args: List[int]) -> None:
+    registers['x'] += args[0]
+
+
+INSTRUCTIONS: Dict[str, InstructionSpec] = {
+    'noop': InstructionSpec(1, _noop),
+    'addx': InstructionSpec(2, _addx),
+}
+
+
+def compile_trace(ops: List[Op]) -> NDArray[np.int64]:
+    costs = np.fromiter((INSTRUCTIONS[o.instruction.name.lower()].cycles for o in ops),
+                        dtype=np.int64, count=len(ops))
+    values = np.fromiter((o.value or 0 for o in ops), dtype=np.int64, count=len(ops))
+    deltas = np.zeros(int(costs.sum()), dtype=np.int64)
+    deltas[np.cumsum(costs) - 1] = values
+    return 1 + np.cumsum(deltas) - deltas
+
+
+def signal_strength(trace: NDArray[np.int64], checks: NDArray[np.int64]) -> int:
+    return int((checks * trace[checks - 1]).sum())
+
+
+def render_crt(trace: NDArray[np.int64], width: int = 40) -> str:
+    columns = np.arange(len(trace)) % width
+    pixels = np.where(np.abs(trace - columns) <= 1, '#', ' ')
+    pixels = np.pad(pixels, (0, -len(pixels) % width), constant_values='').reshape(-1, width)
+    return '\n'.join([''.join(row) for row in pixels])
+
+
+class VM:
+    def __init__(self, instructions: Optional[Dict[str, InstructionSpec]] = None,
+                 registers: Optional[Registers] = None):
+        self.instructions = dict(INSTRUCTIONS if instructions is None else instructions)
+        self.registers = {'x': 1} if registers is None else dict(registers)
+        self.cycle = 0
+        self.hooks: List[CycleHook] = []
+
+    def on_cycle(self, hook: CycleHook) -> CycleHook:
+        self.hooks.append(hook)
+        return hook
+
+    def execute(self, line: str) -> None:
+        name, *args = line.split()
+        spec = self.instructions[name.lower()]
+        for _ in range(spec.cycles):
+            self.cycle += 1
+            for hook in self.hooks:
+                hook(self.cycle, self.registers)
+        spec.effect(self.registers, [int(a) for a in args])
+
+    def run(self, program: Iterable[str]) -> VM:
+        for line in program:
+            if line.strip():
+                self.execute(line)
+        return self
+
+
+class SignalStrength:
+    def __init__(self, checks: Iterable[int], register: str = 'x'):
+        self.checks = set(checks)
+        self.register = register
+        self.total = 0
+
+    def __call__(self, cycle: int, registers: Registers) -> None:
+        if cycle in self.checks:
+            self.total += cycle * registers[self.register]
+
+
+class CrtRenderer:
+    def __init__(self, emit: Callable[[str], None], width: int = 40, register: str = 'x'):
+        self.emit = emit
+        self.width = width
+        self.register = register
+        self.row: List[str] = []
+
+    def __call__(self, cycle: int, registers: Registers) -> None:
+        col = (cycle - 1) % self.width
+        self.row.append('#' if abs(registers[self.register] - col) <= 1 else ' ')
+        if col == self.width - 1:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.row:
+            self.emit(''.join(self.row))
+            self.row = []
+
+
+def day10_stream(emit: Callable[[str], None] = print) -> int:
+    vm = VM()
+    signal = vm.on_cycle(SignalStrength([20, 60, 100, 140, 180, 220]))
+    crt = vm.on_cycle(CrtRenderer(emit))
+    with open('day10input.txt') as f:
+        vm.run(f)
+    crt.flush()
+    return signal.total
+
+
 def day10_1():
-    ops = read_ops()
-    positions = get_positions(ops)
-    checks = [20, 60, 100, 140, 180, 220]
-    signal_strengths = [i * positions[i - 1] for i in checks]
-    return sum(signal_strengths)
+    return signal_strength(compile_trace(read_ops()), np.array([20, 60, 100, 140, 180, 220]))
 
 
 def day10_2():
-    drawn = (
-        {'cycle': n + 1, 'col': n % 40, 'sprite': [p - 1, p, p + 1]}
-        for n, p in enumerate(get_positions(read_ops()))
-    )
-    rows = [''.join(['#' if c['col'] in c['sprite'] else ' ' for c in r]) for r in chunked(drawn, 40)]
-    return '\n'.join(rows)
+    return render_crt(compile_trace(read_ops()))
 
 
 if __name__ == '__main__':